@@ -1,51 +1,98 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
+__all__ = [
+    "ENV",
+    "BASE_DIR",
+    "DB_PATH",
+    "TOKEN_PATH",
+    "SYMBOL_FILE",
+    "LOG_DIR",
+    "FYERS_CLIENT_ID",
+    "FYERS_SECRET_KEY",
+    "FYERS_REDIRECT_URI",
+    "LOOKBACK_YEARS",
+    "DAILY_LOOKBACK_DAYS",
+    "TABLE_NAME",
+    "validate_config",
+]
+
 # =========================================================
 # ENVIRONMENT
 # =========================================================
 # This tells the system WHERE it is running.
 # Default is 'local'. Later you can set ENV=cloud
+#
+# A single snapshot of os.environ is taken at import so every
+# constant below is one plain-dict lookup instead of an os.getenv
+# call; env changes after import are deliberately not picked up.
 
-ENV = os.getenv("ENV", "local")
+_ENV = dict(os.environ)
+
+ENV = _ENV.get("ENV", "local")
 
 # =========================================================
 # PROJECT BASE DIRECTORY
 # =========================================================
 # This finds the ROOT of your project reliably,
 # no matter where the script is run from.
+# Resolved lazily and exactly once per process — resolve()
+# does stat/readlink syscalls we don't want on every import.
+
+
+@lru_cache(maxsize=1)
+def _base_dir() -> Path:
+    return Path(__file__).resolve().parents[1]
 
-BASE_DIR = Path(__file__).resolve().parents[1]
 
 # =========================================================
 # PATHS (all cloud-migratable)
 # =========================================================
 # If ENV variables are present → use them
 # Otherwise → fall back to sensible local defaults
+#
+# Path constants are materialized lazily via module __getattr__
+# (PEP 562): a run that never touches LOG_DIR never resolves it.
+
+_LAZY_PATHS = {
+    "BASE_DIR": lambda: _base_dir(),
+    "DB_PATH": lambda: _ENV.get(
+        "DB_PATH",
+        str(_base_dir() / "data" / "marketdata.db")
+    ),
+    "TOKEN_PATH": lambda: _ENV.get(
+        "TOKEN_PATH",
+        str(_base_dir() / "auth" / "token.json")
+    ),
+    "SYMBOL_FILE": lambda: _ENV.get(
+        "SYMBOL_FILE",
+        str(_base_dir() / "config" / "nifty_100_11Jan26.json")
+    ),
+    "LOG_DIR": lambda: _ENV.get(
+        "LOG_DIR",
+        str(_base_dir() / "logs")
+    ),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_PATHS:
+        value = _LAZY_PATHS[name]()
+        # Cache into module globals so later lookups are plain attributes
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-DB_PATH = os.getenv(
-    "DB_PATH",
-    str(BASE_DIR / "data" / "marketdata.db")
-)
-
-TOKEN_PATH = os.getenv(
-    "TOKEN_PATH",
-    str(BASE_DIR / "auth" / "token.json")
-)
-
-SYMBOL_FILE = os.getenv(
-    "SYMBOL_FILE",
-    str(BASE_DIR / "config" / "nifty_100_11Jan26.json")
-)
 
 # =========================================================
 # FYERS CONFIG (NEVER hardcode secrets)
 # =========================================================
 
-FYERS_CLIENT_ID = os.getenv("FYERS_CLIENT_ID")
-FYERS_SECRET_KEY = os.getenv("FYERS_SECRET_KEY")
+FYERS_CLIENT_ID = _ENV.get("FYERS_CLIENT_ID")
+FYERS_SECRET_KEY = _ENV.get("FYERS_SECRET_KEY")
 
-FYERS_REDIRECT_URI = os.getenv(
+FYERS_REDIRECT_URI = _ENV.get(
     "FYERS_REDIRECT_URI",
     "https://www.google.com"
 )
@@ -57,29 +104,20 @@ FYERS_REDIRECT_URI = os.getenv(
 # not WHERE or HOW.
 
 # Used only for one-time historical backfill
-LOOKBACK_YEARS = int(os.getenv("LOOKBACK_YEARS", "2"))
+LOOKBACK_YEARS = int(_ENV.get("LOOKBACK_YEARS", "2"))
 
 # Used for daily runs (catch-up safe)
-DAILY_LOOKBACK_DAYS = int(os.getenv("DAILY_LOOKBACK_DAYS", "10"))
+DAILY_LOOKBACK_DAYS = int(_ENV.get("DAILY_LOOKBACK_DAYS", "10"))
 
 # =========================================================
 # DATABASE SETTINGS
 # =========================================================
 
-TABLE_NAME = os.getenv(
+TABLE_NAME = _ENV.get(
     "TABLE_NAME",
     "equity_daily_candles_swing_trading"
 )
 
-# =========================================================
-# LOGGING SETTINGS
-# =========================================================
-
-LOG_DIR = os.getenv(
-    "LOG_DIR",
-    str(BASE_DIR / "logs")
-)
-
 # =========================================================
 # VALIDATION
 # =========================================================
@@ -87,16 +125,16 @@ LOG_DIR = os.getenv(
 def validate_config():
     """Validate that required configuration is present."""
     errors = []
-    
+
     if not FYERS_CLIENT_ID:
         errors.append("FYERS_CLIENT_ID not set in environment")
-    
+
     if not FYERS_SECRET_KEY:
         errors.append("FYERS_SECRET_KEY not set in environment")
-    
+
     if errors:
         raise RuntimeError(
             "Configuration errors:\n" + "\n".join(f"  - {e}" for e in errors)
         )
-    
-    return True
\ No newline at end of file
+
+    return True
@@ -1,22 +1,32 @@
 import os
-import json
+import hashlib
 import asyncio
 import subprocess
 import re
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import Dict, TypedDict
 
-from fastapi import FastAPI, BackgroundTasks
+import orjson
+from fastapi import FastAPI, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
 
 # Import existing settings
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
 from config.settings import TOKEN_PATH, LOG_DIR, DB_PATH, TABLE_NAME
 
-app = FastAPI(title="Trading HQ Dashboard")
+# orjson serializes the large symbol_results map several times faster
+# than stdlib json
+app = FastAPI(title="Trading HQ Dashboard", default_response_class=ORJSONResponse)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -27,8 +37,35 @@ app.add_middleware(
 )
 
 # Configuration
-LOG_FILE = os.path.join(LOG_DIR, "backfill.log")
-BACKFILL_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fetcher", "backfill_fyers_equity.py")
+BACKFILL_SCRIPT = os.path.join(PROJECT_ROOT, "fetcher", "backfill_fyers_equity.py")
+UI_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui_config.json")
+
+# These files change only at login / by hand — re-parse only when the
+# mtime moves instead of on every request
+_TOKEN_CACHE = {"mtime": None, "expires_at": None, "expiry": "Unknown"}
+_UI_CONFIG_CACHE = {"mtime": None, "config": {}}
+
+# Compiled once instead of per line per status poll
+_RE_START = re.compile(r"\[(\d+)/(\d+)\] (?:Processing|Incremental update for|Full backfill for) (?:NSE:)?([\w-]+)")
+_RE_UP = re.compile(r"(?:NSE:)?([\w-]+) is already up to date")
+_RE_COMP = re.compile(r"✅ Completed (?:NSE:)?([\w-]+) - (\d+) candles inserted")
+
+# Shared read connection — avoids a file open + schema cache warm per
+# request and keeps SQLite's page cache hot across polls
+_DB = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+_DB.execute("PRAGMA journal_mode=WAL")
+_DB_LOCK = threading.Lock()
+
+# Aggregate stats don't need per-second accuracy on a growing table
+DB_STATS_TTL_S = 30
+
+try:
+    # Lets COUNT(DISTINCT symbol) / MAX(trade_date) run as index-only scans
+    _DB.execute(f"CREATE INDEX IF NOT EXISTS idx_symbol_date ON {TABLE_NAME}(symbol, trade_date)")
+    # Backs the latest-snapshot top-k query
+    _DB.execute(f"CREATE INDEX IF NOT EXISTS idx_trade_date ON {TABLE_NAME}(trade_date DESC)")
+except Exception as e:
+    print(f"DB Index Error: {e}")
 
 # State Management
 class DashboardState:
@@ -44,7 +81,12 @@ class DashboardState:
     # Track results per symbol for this session
     # symbol -> {"status": "", "candles": 0}
     session_symbol_stats: Dict[str, Dict] = {}
-    
+
+    _processed_set: set = set()
+
+    # When the DB stats were last recomputed (monotonic clock)
+    _db_stats_ts = 0.0
+
     # DB Stats
     db_size_mb = 0.0
     total_db_rows = 0
@@ -55,7 +97,9 @@ class DashboardState:
 
 state = DashboardState()
 
-class SummaryResponse(BaseModel):
+class SummaryResponse(TypedDict):
+    # Editor/documentation aid only — the endpoint returns a plain dict
+    # so pydantic's per-field validation never runs on the polling path
     is_running: bool
     token_valid: bool
     token_expiry: str
@@ -75,110 +119,90 @@ class SummaryResponse(BaseModel):
     symbol_results: Dict[str, Dict]
 
 def get_db_stats():
-    """Fetch database health metrics."""
+    """Fetch database health metrics (cached for DB_STATS_TTL_S seconds)."""
+    if time.monotonic() - state._db_stats_ts < DB_STATS_TTL_S:
+        return
+
     if os.path.exists(DB_PATH):
         state.db_size_mb = round(os.path.getsize(DB_PATH) / (1024 * 1024), 2)
     
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT COUNT(*), COUNT(DISTINCT symbol), MIN(trade_date), MAX(trade_date) FROM {TABLE_NAME}")
-        rows, syms, d1, d2 = cursor.fetchone()
+        with _DB_LOCK:
+            cursor = _DB.cursor()
+            cursor.execute(f"SELECT COUNT(*), COUNT(DISTINCT symbol), MIN(trade_date), MAX(trade_date) FROM {TABLE_NAME}")
+            rows, syms, d1, d2 = cursor.fetchone()
         state.total_db_rows = rows or 0
         state.unique_symbols = syms or 0
         state.min_date = d1 or "N/A"
         state.max_date = d2 or "N/A"
-        conn.close()
+        state._db_stats_ts = time.monotonic()
     except Exception as e:
         print(f"DB Stat Error: {e}")
 
-def parse_log_for_summary():
-    """Parses the log file to update the session state."""
-    if not os.path.exists(LOG_FILE):
-        return
+def _ingest_line(line: str):
+    """Feed one line of backfill output through the progress regexes."""
+    # Detect processing start
+    if match_start := _RE_START.search(line):
+        s_name = match_start.group(3)
+        state.current_symbol = s_name
+        state._processed_set.add(s_name)
+        state.session_symbol_stats[s_name] = {"status": "active", "candles": 0}
+        state.total_symbols = int(match_start.group(2))
 
-    try:
-        with open(LOG_FILE, "r") as f:
-            f.seek(0, os.SEEK_END)
-            size = f.tell()
-            f.seek(max(0, size - 400000)) 
-            lines = f.readlines()
-            
-        processed_set = set()
-        updated_count = 0
-        uptodate_count = 0
-        candle_count = 0
-        current = "Idle"
-        
-        for line in lines:
-            # Detect processing start
-            match_start = re.search(r"\[(\d+)/(\d+)\] (?:Processing|Incremental update for|Full backfill for) (?:NSE:)?([\w-]+)", line)
-            if match_start:
-                s_name = match_start.group(3)
-                current = s_name
-                processed_set.add(s_name)
-                state.session_symbol_stats[s_name] = {"status": "active", "candles": 0}
-                state.total_symbols = int(match_start.group(2))
-
-            # Detect Up to date
-            match_up = re.search(r"(?:NSE:)?([\w-]+) is already up to date", line)
-            if match_up:
-                s_name = match_up.group(1)
-                processed_set.add(s_name)
-                uptodate_count += 1
-                state.session_symbol_stats[s_name] = {"status": "uptodate", "candles": 0}
-
-            # Detect Completion
-            match_comp = re.search(r"✅ Completed - (\d+) candles inserted", line)
-            if match_comp:
-                count = int(match_comp.group(1))
-                candle_count += count
-                if current != "Idle":
-                    if count > 0:
-                        updated_count += 1
-                        state.session_symbol_stats[current] = {"status": "updated", "candles": count}
-                    else:
-                        if state.session_symbol_stats.get(current, {}).get("status") != "uptodate":
-                            state.session_symbol_stats[current] = {"status": "uptodate", "candles": 0}
-
-        state.processed = len(processed_set)
-        state.updated = updated_count
-        state.up_to_date = uptodate_count
-        state.total_candles = candle_count
-        state.current_symbol = current
-        
-    except Exception as e:
-        print(f"Log Parse Error: {e}")
+    # Detect Up to date
+    if match_up := _RE_UP.search(line):
+        s_name = match_up.group(1)
+        state._processed_set.add(s_name)
+        state.up_to_date += 1
+        state.session_symbol_stats[s_name] = {"status": "uptodate", "candles": 0}
+
+    # Detect Completion — attributed by the symbol in the line itself,
+    # since completions from concurrent workers interleave and
+    # current_symbol only tracks the most recently started one
+    if match_comp := _RE_COMP.search(line):
+        s_name = match_comp.group(1)
+        count = int(match_comp.group(2))
+        state.total_candles += count
+        state._processed_set.add(s_name)
+        if count > 0:
+            state.updated += 1
+            state.session_symbol_stats[s_name] = {"status": "updated", "candles": count}
+        elif state.session_symbol_stats.get(s_name, {}).get("status") != "uptodate":
+            state.session_symbol_stats[s_name] = {"status": "uptodate", "candles": 0}
+
+    state.processed = len(state._processed_set)
 
 @app.get("/api/ui_config")
 async def get_ui_config():
-    config_path = os.path.join(os.path.dirname(__file__), "ui_config.json")
-    if os.path.exists(config_path):
-        import json
-        with open(config_path, "r") as f:
-            return json.load(f)
+    if os.path.exists(UI_CONFIG_PATH):
+        mtime = os.stat(UI_CONFIG_PATH).st_mtime
+        if mtime != _UI_CONFIG_CACHE["mtime"]:
+            with open(UI_CONFIG_PATH, "rb") as f:
+                _UI_CONFIG_CACHE["config"] = orjson.loads(f.read())
+            _UI_CONFIG_CACHE["mtime"] = mtime
+        return _UI_CONFIG_CACHE["config"]
     return {}
 
-@app.get("/api/latest_snapshot")
-async def get_latest_snapshot():
-    try:
-        import sqlite3
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # Query the latest record for each of the 10 most recently updated symbols
+@lru_cache(maxsize=1)
+def _latest_snapshot_rows(bucket: int):
+    """Fetch the 10 most recent candles; `bucket` expires the cache every 5s."""
+    with _DB_LOCK:
+        cursor = _DB.cursor()
+        # Top-k walk down idx_trade_date instead of a full reverse scan,
+        # ordered by trade_date rather than insertion order
         cursor.execute(f"""
-            SELECT symbol, trade_date, open, high, low, close, volume 
-            FROM {TABLE_NAME} 
-            WHERE ROWID IN (
-                SELECT MAX(ROWID) 
-                FROM {TABLE_NAME} 
-                GROUP BY symbol
-            )
-            ORDER BY ROWID DESC 
+            SELECT symbol, trade_date, open, high, low, close, volume
+            FROM {TABLE_NAME}
+            ORDER BY trade_date DESC, symbol
             LIMIT 10
         """)
-        rows = cursor.fetchall()
-        conn.close()
+        return cursor.fetchall()
+
+
+@app.get("/api/latest_snapshot")
+async def get_latest_snapshot():
+    try:
+        rows = _latest_snapshot_rows(int(time.monotonic() / 5))
         return [
             {
                 "symbol": r[0],
@@ -194,24 +218,43 @@ async def get_latest_snapshot():
         print(f"Snapshot Error: {e}")
         return []
 
-@app.get("/api/status", response_model=SummaryResponse)
-async def get_status():
+@app.get("/api/status")
+async def get_status(request: Request, response: Response):
     token_valid = False
     token_expiry = "Unknown"
     
     if os.path.exists(TOKEN_PATH):
         try:
-            with open(TOKEN_PATH, "r") as f:
-                data = json.load(f)
+            mtime = os.stat(TOKEN_PATH).st_mtime
+            if mtime != _TOKEN_CACHE["mtime"]:
+                with open(TOKEN_PATH, "rb") as f:
+                    data = orjson.loads(f.read())
                 expires_at = datetime.fromisoformat(data["expires_at"])
-                token_valid = datetime.now() < expires_at
-                token_expiry = expires_at.strftime("%Y-%m-%d %H:%M")
+                _TOKEN_CACHE["mtime"] = mtime
+                _TOKEN_CACHE["expires_at"] = expires_at
+                _TOKEN_CACHE["expiry"] = expires_at.strftime("%Y-%m-%d %H:%M")
+            # Validity still depends on the current clock, not the cache
+            token_valid = datetime.now() < _TOKEN_CACHE["expires_at"]
+            token_expiry = _TOKEN_CACHE["expiry"]
         except:
             pass
     
-    parse_log_for_summary()
     get_db_stats()
-            
+
+    # Skip serializing the full payload when nothing changed since the
+    # client's last poll — the typical case for an idle dashboard.
+    # _db_stats_ts busts the tag whenever the DB stats refresh, so
+    # growth from backfills run outside the dashboard still shows up
+    etag = hashlib.blake2b(
+        f"{state.is_running}|{state.processed}|{state.updated}|{state.total_candles}|{state.current_symbol}|{state.up_to_date}|{token_valid}|{state._db_stats_ts}".encode(),
+        digest_size=8
+    ).hexdigest()
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    response.headers["ETag"] = etag
+
     return {
         "is_running": state.is_running,
         "token_valid": token_valid,
@@ -240,8 +283,18 @@ async def run_backfill_task():
             "python", "-u", BACKFILL_SCRIPT,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cwd=PROJECT_ROOT
         )
+
+        # Ingest progress directly from the pipes (also keeps the child
+        # from blocking on a full pipe buffer). The backfill logs via a
+        # StreamHandler, so progress lines arrive on stderr; the backfill
+        # log file stays on disk for post-mortem debugging only.
+        async def _drain(stream):
+            async for raw in stream:
+                _ingest_line(raw.decode(errors="replace"))
+
+        await asyncio.gather(_drain(process.stdout), _drain(process.stderr))
         await process.wait()
     finally:
         state.is_running = False
@@ -257,6 +310,7 @@ async def start_backfill(background_tasks: BackgroundTasks):
     state.up_to_date = 0
     state.total_candles = 0
     state.session_symbol_stats = {}
+    state._processed_set = set()
     
     background_tasks.add_task(run_backfill_task)
     return {"message": "Started"}
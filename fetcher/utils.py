@@ -0,0 +1,72 @@
+import logging
+from datetime import datetime
+
+import orjson
+
+from config.settings import TOKEN_PATH
+
+logger = logging.getLogger(__name__)
+
+# ===============================
+# DATA VALIDATION
+# ===============================
+
+def validate_candle_data(symbol: str, candle: list) -> bool:
+    """Validate that candle data is reasonable."""
+    try:
+        ts, o, h, l, c, v = candle
+
+        # Check for negative or zero prices
+        if any(price <= 0 for price in [o, h, l, c]):
+            logger.warning(f"Invalid prices for {symbol}: O={o}, H={h}, L={l}, C={c}")
+            return False
+
+        # Check OHLC relationships
+        if h < max(o, c) or l > min(o, c):
+            logger.warning(f"Invalid OHLC relationship for {symbol}: O={o}, H={h}, L={l}, C={c}")
+            return False
+
+        # Check for negative volume
+        if v < 0:
+            logger.warning(f"Negative volume for {symbol}: {v}")
+            return False
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Error validating candle for {symbol}: {e}")
+        return False
+
+# ===============================
+# TOKEN MANAGEMENT
+# ===============================
+
+def load_access_token() -> str:
+    """Load and validate access token."""
+    try:
+        with open(TOKEN_PATH, "rb") as f:
+            token_data = orjson.loads(f.read())
+
+        access_token = token_data.get("access_token")
+        if not access_token:
+            raise ValueError("No access_token found in token file")
+
+        # Check expiration if available
+        expires_at = token_data.get("expires_at")
+        if expires_at:
+            expiry_time = datetime.fromisoformat(expires_at)
+            if datetime.now() >= expiry_time:
+                logger.error("Access token has expired. Please run login.py again.")
+                raise RuntimeError("Access token expired")
+            else:
+                time_remaining = expiry_time - datetime.now()
+                logger.info(f"Token valid for {time_remaining.total_seconds() / 3600:.1f} more hours")
+
+        return access_token
+
+    except FileNotFoundError:
+        logger.error(f"Token file not found at {TOKEN_PATH}. Please run login.py first.")
+        raise
+    except Exception as e:
+        logger.error(f"Error loading token: {e}")
+        raise
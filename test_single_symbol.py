@@ -1,10 +1,11 @@
 import json
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from fyers_apiv3 import fyersModel
 from config.settings import FYERS_CLIENT_ID, TOKEN_PATH, LOG_DIR, validate_config
-from fetcher.backfill_fyers_equity import load_access_token, validate_candle_data
+from fetcher.utils import load_access_token, validate_candle_data
 
 # Setup logging
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -63,7 +64,8 @@ if response.get("s") == "ok":
         if validate_candle_data(symbol, candle):
             valid_count += 1
             ts, o, h, l, c, v = candle
-            trade_date = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+            # gmtime avoids building a tz-aware datetime per candle
+            trade_date = time.strftime("%Y-%m-%d", time.gmtime(ts))
             print(f"{trade_date}: O={o:8.2f}, H={h:8.2f}, L={l:8.2f}, C={c:8.2f}, V={v:,}")
     
     print("-" * 60)